@@ -27,10 +27,12 @@ class Configs(FRRConfigs):
     bgpd = """
     #% extends "boilerplate.conf"
     #% block main
+    #%   if env.TOPOTATO_DEBUG_BGP
     debug bgp updates
     debug bgp zebra
     debug bgp nht
     debug bgp neighbor-events
+    #%   endif
 
     #%   if router.name == 'r1'
     router bgp 65000
@@ -49,6 +51,16 @@ class Configs(FRRConfigs):
     """
 
 
+_links = ["u1", "u2"]
+
+
+def _peer_ll6s(r_other):
+    """
+    Link-local addresses of the other router on both links, in _links order.
+    """
+    return [r_other.iface_to(link).ll6_str for link in _links]
+
+
 class BGP_ECMP_RFC5549(TestBase, AutoFixture, topo=topology, configs=Configs):
     """
     BGP ECMP + RFC5549 IPv4 routes w/ IPv6 nexthops combination test.
@@ -66,15 +78,11 @@ class BGP_ECMP_RFC5549(TestBase, AutoFixture, topo=topology, configs=Configs):
         """
 
         for r_self in r1, r2:
-            r_other = r_self.flip("r1", "r2")
-
             expected = {
-                str(r_other.iface_to("u1").ll6): {
+                ll6: {
                     "bgpState": "Established",
-                },
-                str(r_other.iface_to("u2").ll6): {
-                    "bgpState": "Established",
-                },
+                }
+                for ll6 in _peer_ll6s(r_self.flip("r1", "r2"))
             }
             yield from AssertVtysh.make(
                 r_self,
@@ -91,7 +99,6 @@ class BGP_ECMP_RFC5549(TestBase, AutoFixture, topo=topology, configs=Configs):
         """
 
         for r_self, other_lan in (r1, "lan2"), (r2, "lan1"):
-            r_other = r_self.flip("r1", "r2")
             prefix = str(topo.lans[other_lan].ip4[0])
 
             expected = {
@@ -99,23 +106,14 @@ class BGP_ECMP_RFC5549(TestBase, AutoFixture, topo=topology, configs=Configs):
                     {
                         "nexthops": [
                             {
-                                "ip": str(r_other.iface_to("u1").ll6),
+                                "ip": ll6,
                             },
                         ],
                         "peer": {
-                            "peerId": str(r_other.iface_to("u1").ll6),
+                            "peerId": ll6,
                         },
-                    },
-                    {
-                        "nexthops": [
-                            {
-                                "ip": str(r_other.iface_to("u2").ll6),
-                            },
-                        ],
-                        "peer": {
-                            "peerId": str(r_other.iface_to("u2").ll6),
-                        },
-                    },
+                    }
+                    for ll6 in _peer_ll6s(r_self.flip("r1", "r2"))
                 ],
             }
             yield from AssertVtysh.make(
@@ -132,6 +130,8 @@ class BGP_ECMP_RFC5549(TestBase, AutoFixture, topo=topology, configs=Configs):
         Verify ECMP routes have been correctly installed into the kernel.
         """
         for rtr, other_lan in (r1, "lan2"), (r2, "lan1"):
+            ll6s = _peer_ll6s(rtr.flip("r1", "r2"))
+
             yield from AssertKernelRoutesV4.make(
                 rtr.name,
                 {
@@ -139,22 +139,15 @@ class BGP_ECMP_RFC5549(TestBase, AutoFixture, topo=topology, configs=Configs):
                         {
                             "nexthops": [
                                 JSONCompareListKeyedDict("dev"),
+                            ]
+                            + [
                                 {
-                                    "dev": rtr.iface_to("u1").ifname,
-                                    "via": {
-                                        "host": str(
-                                            rtr.flip("r1", "r2").iface_to("u1").ll6
-                                        ),
-                                    },
-                                },
-                                {
-                                    "dev": rtr.iface_to("u2").ifname,
+                                    "dev": rtr.iface_to(link).ifname,
                                     "via": {
-                                        "host": str(
-                                            rtr.flip("r1", "r2").iface_to("u2").ll6
-                                        ),
+                                        "host": ll6,
                                     },
-                                },
+                                }
+                                for link, ll6 in zip(_links, ll6s)
                             ],
                         },
                     ],
@@ -1,4 +1,68 @@
 import sys
 import os
+import errno
+import socket
+
+import pytest
 
 sys.path.insert(0, os.path.relpath("..", os.path.dirname(__file__)))
+
+# pylint: disable=wrong-import-position
+from topotato.leaks import FDState
+
+
+@pytest.fixture(scope="session")
+def fd_baseline():
+    """
+    FD state snapshot taken once at the start of the selftest session.
+
+    Only useful for checks that don't care about fds opened by other tests
+    in the meantime.
+    """
+    return FDState()
+
+
+class FDArena:
+    """
+    Track fds opened by a test so they are all closed on teardown, even if
+    the test fails halfway (or the fds got shuffled around with dup2.)
+    """
+
+    def __init__(self):
+        self.fds = set()
+
+    def pipe(self):
+        r, w = os.pipe()
+        self.fds.update((r, w))
+        return r, w
+
+    def socketpair(self, *args):
+        a, b = socket.socketpair(*args)
+        fds = a.detach(), b.detach()
+        self.fds.update(fds)
+        return fds
+
+    def dup2(self, src, dst):
+        os.dup2(src, dst)
+        self.fds.add(dst)
+
+    def close(self, fd):
+        self.fds.discard(fd)
+        os.close(fd)
+
+    def close_all(self):
+        while self.fds:
+            try:
+                os.close(self.fds.pop())
+            except OSError as e:
+                if e.errno != errno.EBADF:
+                    raise
+
+
+@pytest.fixture
+def fd_arena():
+    arena = FDArena()
+    try:
+        yield arena
+    finally:
+        arena.close_all()
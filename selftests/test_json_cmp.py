@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+# Copyright (C) 2024  David Lamparter for NetDEF, Inc.
+"""
+test json_cmp() list handling
+"""
+
+from topotato.utils import json_cmp, JSONCompareListKeyedDict
+
+_nexthops = [
+    {"dev": "r1-u1", "via": {"host": "fe80::1"}},
+    {"dev": "r1-u2", "via": {"host": "fe80::2"}},
+]
+
+
+def test_keyed_match():
+    expect = [
+        JSONCompareListKeyedDict("dev"),
+        {"dev": "r1-u2", "via": {"host": "fe80::2"}},
+        {"dev": "r1-u1", "via": {"host": "fe80::1"}},
+    ]
+    assert json_cmp(_nexthops, expect) is None
+
+
+def test_keyed_mismatch():
+    expect = [
+        JSONCompareListKeyedDict("dev"),
+        {"dev": "r1-u1", "via": {"host": "fe80::2"}},
+    ]
+    assert json_cmp(_nexthops, expect) is not None
+
+
+def test_keyed_missing():
+    expect = [
+        JSONCompareListKeyedDict("dev"),
+        {"dev": "r1-u3"},
+    ]
+    assert "no item found" in str(json_cmp(_nexthops, expect))
+
+
+def test_keyed_nonscalar():
+    expect = [
+        JSONCompareListKeyedDict("via"),
+        {"via": {"host": "fe80::1"}},
+    ]
+    assert json_cmp(_nexthops, expect) is None
+
+
+def test_keyed_multiple():
+    expect = [
+        JSONCompareListKeyedDict("dev"),
+        {"dev": "r1-u1"},
+    ]
+    assert "multiple items" in str(json_cmp(_nexthops + _nexthops[:1], expect))
+
+
+def test_dict_diff():
+    res = json_cmp({"a": {"b": 1}}, {"a": {"b": 2}})
+    assert res is not None
+    assert 'json["a"]["b"] dict value is different' in str(res)
+    assert "-2" in str(res) and "+1" in str(res)
+
+
+def test_inputs_unmodified():
+    data = [dict(item) for item in _nexthops]
+    expect = [
+        JSONCompareListKeyedDict("dev"),
+        {"dev": "r1-u1"},
+    ]
+    expect_copy = list(expect)
+    assert json_cmp(data, expect) is None
+    assert expect == expect_copy
+    assert data == _nexthops
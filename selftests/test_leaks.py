@@ -62,22 +62,21 @@ def test_fdinfo_ns():
     assert "mnt" in i
 
 
-def test_fdstate():
-    state = FDState()
-    assert 1 in state
+def test_fdstate(fd_baseline):
+    assert 1 in fd_baseline
 
 
-def test_fddelta():
+def test_fddelta(fd_arena):
     state0 = FDState()
     state1 = FDState()
 
-    a, b = os.pipe()
+    a, b = fd_arena.pipe()
 
     state2 = FDState()
 
-    c, d = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
-    os.dup2(d.fileno(), b)
-    os.close(a)
+    _, d = fd_arena.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    fd_arena.dup2(d, b)
+    fd_arena.close(a)
 
     state3 = FDState()
 
@@ -91,6 +90,3 @@ def test_fddelta():
     delta23 = FDDelta(state2, state3)
     assert a in delta23.closed
     assert b in delta23.changed
-
-    c.close()
-    d.close()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+# Copyright (C) 2024  David Lamparter for NetDEF, Inc.
+"""
+test text_rich_cmp() / text_rich_compile()
+"""
+
+from topotato.utils import text_rich_cmp, text_rich_compile
+
+
+class _Params:
+    def eval(self, expr):
+        return {"name": "r1"}[expr.strip()]
+
+
+def test_plain():
+    assert text_rich_cmp(None, "a\nb", "a\nb", "out") is None
+    assert text_rich_cmp(None, "a\nc", "a\nb", "out") is not None
+
+
+def test_regex():
+    assert text_rich_cmp(None, "up 00:12:34", r"up 00:$$\d+:\d+$$", "out") is None
+    assert text_rich_cmp(None, "up 00:xx:34", r"up 00:$$\d+:\d+$$", "out") is not None
+
+
+def test_eval():
+    assert text_rich_cmp(_Params(), "host r1", "host $$=name$$", "out") is None
+    assert text_rich_cmp(_Params(), "host r2", "host $$=name$$", "out") is not None
+
+
+def test_precompiled():
+    lines = text_rich_compile(_Params(), "  host $$=name$$\n  up $$\\d+$$\n")
+    assert text_rich_cmp(None, "host r1\nup 5\n", lines, "out") is None
+    assert text_rich_cmp(None, "host r1\nup 6\n", lines, "out") is None
+    assert text_rich_cmp(None, "host r1\nup x\n", lines, "out") is not None
@@ -69,11 +69,13 @@ class Setup(TopotatoNetwork, topo=topology):
     src: Host
 
 
-def iter_mld_records(report):
+def mld_records(report):
+    records = []
     for record in report.records:
         while isinstance(record, ICMPv6MLDMultAddrRec):
-            yield record
+            records.append(record)
             record = record.payload
+    return records
 
 class MLDBasic(TestBase, AutoFixture, setup=Setup):
     @topotatofunc(include_startup=True)
@@ -88,9 +90,8 @@ class MLDBasic(TestBase, AutoFixture, setup=Setup):
 
         # get out of initial reporting (prevents timing issues later)
         def expect_pkt(ipv6: IPv6, report: ICMPv6MLReport2):
-            for record in iter_mld_records(report):
-                if record.rtype == 2: # IS_EX
-                    return True
+            # 2 = IS_EX
+            return any(record.rtype == 2 for record in mld_records(report))
         yield from AssertPacket.make("h1_dut", maxwait=2.0, pkt=expect_pkt)
 
     @topotatofunc
@@ -117,8 +118,10 @@ class MLDBasic(TestBase, AutoFixture, setup=Setup):
             pkt = ip/udp,
         )
 
+        srcstr = str(srcaddr)
+
         def expect_pkt(ipv6: IPv6, udp: UDP):
-            return ipv6.src == str(srcaddr) and ipv6.dst == 'ff05::2345' \
+            return ipv6.src == srcstr and ipv6.dst == 'ff05::2345' \
                 and udp.dport == 9999
 
         yield from AssertPacket.make("h1_dut", maxwait=2.0, pkt=expect_pkt)
@@ -220,19 +220,20 @@ class OSPFTopo1Test(TestBase, AutoFixture, topo=topology, configs=Configs):
 
             ''', maxwait = 30.0)
 
-        for rtr in topo.routers.keys():
-            yield from AssertKernelRoutesV4.make(rtr, {
-                '10.7.0.0/16':   JSONCompareIgnoreContent(),
-                '10.101.0.0/16': JSONCompareIgnoreContent(),
-                '10.102.0.0/16': JSONCompareIgnoreContent(),
-                '10.103.0.0/16': JSONCompareIgnoreContent(),
-                '10.104.0.0/16': JSONCompareIgnoreContent(),
-                '10.105.0.0/16': JSONCompareIgnoreContent(),
-                '10.255.0.1/32': JSONCompareIgnoreContent(),
-                '10.255.0.2/32': JSONCompareIgnoreContent(),
-                '10.255.0.3/32': JSONCompareIgnoreContent(),
-                '10.255.0.4/32': JSONCompareIgnoreContent(),
-            }, local = True)
+        expect_v4 = {
+            '10.7.0.0/16':   JSONCompareIgnoreContent(),
+            '10.101.0.0/16': JSONCompareIgnoreContent(),
+            '10.102.0.0/16': JSONCompareIgnoreContent(),
+            '10.103.0.0/16': JSONCompareIgnoreContent(),
+            '10.104.0.0/16': JSONCompareIgnoreContent(),
+            '10.105.0.0/16': JSONCompareIgnoreContent(),
+            '10.255.0.1/32': JSONCompareIgnoreContent(),
+            '10.255.0.2/32': JSONCompareIgnoreContent(),
+            '10.255.0.3/32': JSONCompareIgnoreContent(),
+            '10.255.0.4/32': JSONCompareIgnoreContent(),
+        }
+        for rtr in topo.routers:
+            yield from AssertKernelRoutesV4.make(rtr, expect_v4, local = True)
 
         yield from AssertVtysh.make(r1, 'ospf6d', 'show ipv6 ospf6 route', r'''
             *N E2 fd00::2/128                    fe80::fc02:ff:febc:300    r1-lan3 00:$$\d+:\d+$$
@@ -298,18 +299,19 @@ class OSPFTopo1Test(TestBase, AutoFixture, topo=topology, configs=Configs):
             *N IA fdbc:5::/64                    ::                        r4-lan6 00:$$\d+:\d+$$
             ''', maxwait = 30.0)
 
-        for rtr in topo.routers.keys():
-            yield from AssertKernelRoutesV6.make(rtr, {
-                'fd00::1/128': JSONCompareIgnoreContent(),
-                'fd00::2/128': JSONCompareIgnoreContent(),
-                'fd00::3/128': JSONCompareIgnoreContent(),
-                'fd00::4/128': JSONCompareIgnoreContent(),
-                'fdbc:1::/64': JSONCompareIgnoreContent(),
-                'fdbc:2::/64': JSONCompareIgnoreContent(),
-                'fdbc:3::/64': JSONCompareIgnoreContent(),
-                'fdbc:4::/64': JSONCompareIgnoreContent(),
-                'fdbc:5::/64': JSONCompareIgnoreContent(),
-            }, local = True)
+        expect_v6 = {
+            'fd00::1/128': JSONCompareIgnoreContent(),
+            'fd00::2/128': JSONCompareIgnoreContent(),
+            'fd00::3/128': JSONCompareIgnoreContent(),
+            'fd00::4/128': JSONCompareIgnoreContent(),
+            'fdbc:1::/64': JSONCompareIgnoreContent(),
+            'fdbc:2::/64': JSONCompareIgnoreContent(),
+            'fdbc:3::/64': JSONCompareIgnoreContent(),
+            'fdbc:4::/64': JSONCompareIgnoreContent(),
+            'fdbc:5::/64': JSONCompareIgnoreContent(),
+        }
+        for rtr in topo.routers:
+            yield from AssertKernelRoutesV6.make(rtr, expect_v6, local = True)
 
 
     @topotatofunc
@@ -66,19 +66,20 @@ class RIPAllowECMP(TestBase, AutoFixture, topo=topology, configs=Configs):
             JSONCompareListKeyedDict("ip"),
         ]
         for rtr in routers:
+            addr = str(rtr.iface_to("s1").ip4[0].ip)
             yang.append(
                 {
                     "nh-type": "ip4",
                     "protocol": "rip",
                     "rip-type": "normal",
-                    "gateway": str(rtr.iface_to("s1").ip4[0].ip),
-                    "from": str(rtr.iface_to("s1").ip4[0].ip),
+                    "gateway": addr,
+                    "from": addr,
                     "tag": 0,
                 }
             )
             ip.append(
                 {
-                    "ip": str(rtr.iface_to("s1").ip4[0].ip),
+                    "ip": addr,
                     "active": True,
                 }
             )
@@ -11,9 +11,10 @@ import sys
 import json
 import logging
 import tempfile
+import time
 import re
 import inspect
-from collections import OrderedDict
+import functools
 
 import typing
 from typing import (
@@ -23,6 +24,7 @@ from typing import (
     ClassVar,
     List,
     Optional,
+    Tuple,
     Type,
     Union,
 )
@@ -32,9 +34,24 @@ try:
 except ImportError:
     from typing_extensions import Literal  # type: ignore
 
+# orjson is optional; it parses large "show ... json" outputs several times
+# faster, which adds up when polling them for convergence
+try:
+    from orjson import loads as orjson_loads
+except ImportError:
+    orjson_loads = None  # type: ignore[assignment]
+
 from scapy.packet import Packet  # type: ignore
 
-from .utils import json_cmp, text_rich_cmp, deindent
+from .utils import (
+    json_cmp,
+    json_cmp_result,
+    text_rich_cmp,
+    text_rich_compile,
+    deindent,
+    RichCmpLines,
+)
+from .defer import subprocess
 from .base import TopotatoItem, TopotatoFunction, skiptrace, SkipMode
 from .livescapy import TimedScapy
 from .frr.livelog import LogMessage
@@ -68,6 +85,9 @@ __all__ = [
 
 _logger = logging.getLogger(__name__)
 
+# background commands are run from the topotato checkout
+_basedir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 class TopotatoAssertion(TopotatoItem):
     """
@@ -118,6 +138,7 @@ class TimedMixin:
     """
 
     _timing: TimingParams
+    _function: TopotatoFunction
 
     default_delay: ClassVar[Optional[float]] = None
     """
@@ -149,13 +170,13 @@ class TimedMixin:
 
         fn = cast(TopotatoItem, self).getparent(TopotatoFunction)
         assert fn is not None
+        self._function = fn
         if fn.include_startup:
             self._timing.full_history = True
 
     def relative_start(self):
-        fn = cast(TopotatoItem, self).getparent(TopotatoFunction)
-        assert fn is not None
-        return fn.started_ts
+        # called on every timing evaluation, don't walk up the tree each time
+        return self._function.started_ts
 
 
 class AssertKernelRoutes(TimedMixin, TopotatoAssertion):
@@ -165,6 +186,11 @@ class AssertKernelRoutes(TimedMixin, TopotatoAssertion):
 
     af: ClassVar[Union[Literal[4], Literal[6]]]
     default_delay = 0.1
+    redump_ticks = 10
+    """
+    Re-dump the routing table at least this often (in ticks) even if the
+    route monitor saw no change.
+    """
 
     _rtr: str
     _routes: dict
@@ -183,14 +209,41 @@ class AssertKernelRoutes(TimedMixin, TopotatoAssertion):
 
     def __call__(self):
         router = self.instance.routers[self._rtr]
-
-        for _ in self.timeline.run_tick(self._timing):
-            routes = router.routes(self.af, self._local)
-            diff = json_cmp(routes, self._routes)
-            if diff is None:
-                break
-        else:
-            raise TopotatoRouteCompareFail(str(diff))
+        _, end = self._timing.evaluate()
+
+        # subscribe before the first dump so no change can slip through
+        # between the two; afterwards, only dump again if something changed
+        monitor = router.route_monitor(self.af)
+        diff = None
+        last_routes = None
+        try:
+            for tick in self.timeline.run_tick(self._timing):
+                if diff is not None and monitor is not None:
+                    changed = monitor.changed()
+                    # the kernel doesn't notify for everything, e.g. nexthop
+                    # linkdown flags or IPv4 routes flushed along with an
+                    # address/interface; so dump anyway every few ticks and
+                    # on the last one
+                    if (
+                        not changed
+                        and tick % self.redump_ticks
+                        and time.time() + self._timing.delay < end
+                    ):
+                        continue
+                routes = router.routes(self.af, self._local)
+                # notifications can be for routes that aren't in the dump,
+                # and without a monitor this is polled on every tick anyway
+                if routes == last_routes:
+                    continue
+                last_routes = routes
+                diff = json_cmp(routes, self._routes)
+                if diff is None:
+                    break
+            else:
+                raise TopotatoRouteCompareFail(str(diff))
+        finally:
+            if monitor is not None:
+                monitor.close()
 
 
 class AssertKernelRoutesV4(AssertKernelRoutes):
@@ -226,16 +279,55 @@ class AssertKernelRoutesV6(AssertKernelRoutes):
     af = 6
 
 
+def _json_loads(text: str) -> Any:
+    """
+    Parse JSON with orjson if available, with the stdlib json module otherwise.
+
+    orjson is stricter than the stdlib module (it rejects e.g. NaN/Infinity
+    and lone surrogates), anything it refuses is handed to the stdlib parser
+    so the result doesn't depend on whether orjson is installed.  (orjson
+    does return integers outside the 64-bit range as float, but FRR's JSON
+    output comes from json-c, which can't produce those.)
+    """
+    if orjson_loads is not None:
+        try:
+            return orjson_loads(text)
+        # orjson.JSONDecodeError is a subclass of this
+        except json.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
 class AssertVtysh(TimedMixin, TopotatoAssertion):
+    """
+    Run a vtysh command and compare its output against a reference.
+
+    .. py:method:: make(rtr, daemon, command, compare=None, *, filters=None, delay=0.1, maxwait=None)
+       :classmethod:
+
+       :param .toponom.Router rtr: Router to run the command on.
+       :param str daemon: Daemon to send the command to, or ``"vtysh"`` to
+          go through the actual vtysh binary.
+       :param str command: Command to execute.
+       :param compare: Either text (with ``$$regex$$`` and ``$$=expr$$``
+          embedded, cf. :py:func:`.utils.text_rich_cmp`), or a dict to compare
+          against JSON output with :py:func:`.utils.json_cmp`.  If None, only
+          the command's success is checked.
+
+    Since ``maxwait`` is anchored at the start of the test function (refer to
+    :py:class:`TimedMixin`), a sequence of these assertions on different
+    routers only waits as long as the slowest one needs to converge, not the
+    sum of all of them.  There is no need to run them in parallel.
+    """
+
     _nodename = "vtysh"
     _cmdprefix = ""
 
-    commands: OrderedDict
-
     _rtr: "toponom.Router"
     _daemon: str
     _command: str
     _compare: Optional[str]
+    _compare_lines: RichCmpLines
     _filters: List[Callable[[str], str]]
 
     default_delay = 0.1
@@ -257,11 +349,9 @@ class AssertVtysh(TimedMixin, TopotatoAssertion):
         filters=None,
         **kwargs,
     ):
-        command_cleaned = command
-        command_cleaned = re.sub(r"(?m)^[\s\n]+", "", command_cleaned)
-        command_cleaned = re.sub(r"\s+\n", "\n", command_cleaned)
-        command_cleaned = command_cleaned.rstrip("\n")
-        command_cleaned = re.sub(r"\n+", "; ", command_cleaned)
+        # one-line version of (possibly multi-line) command for item name
+        lines = (line.strip() for line in command.splitlines())
+        command_cleaned = "; ".join(line for line in lines if line)
 
         name = "%s:%s/%s/%s[%s]" % (
             name,
@@ -281,6 +371,16 @@ class AssertVtysh(TimedMixin, TopotatoAssertion):
     def __call__(self):
         router = cast("FRRRouterNS", self.instance.routers[self._rtr.name])
 
+        # expected text doesn't change between retries, only parse it once
+        if isinstance(self._compare, str):
+            self._compare_lines = text_rich_compile(router._configs, self._compare)
+
+        # output tends to stay the same for many polls until the daemon
+        # converges; don't redo the comparison on identical output
+        last_text: Optional[str] = None
+        last_result: Union[None, BaseException, json_cmp_result] = None
+        result: Union[None, BaseException, json_cmp_result] = None
+
         for _ in self.timeline.run_tick(self._timing):
             _, out, rc = router.vtysh_polled(self.timeline, self._daemon, self._command)
             if rc != 0:
@@ -290,32 +390,42 @@ class AssertVtysh(TimedMixin, TopotatoAssertion):
                     msg = f"{msg}, output: {line}"
                 result = TopotatoCLIUnsuccessfulFail(msg)
             else:
-                result = None
                 text = "".join(event.text for event in out)
 
-                if isinstance(self._compare, type(None)):
-                    pass
-                elif isinstance(self._compare, str):
-                    for filterfn in self._filters:
-                        text = filterfn(text)
-                    result = text_rich_cmp(
-                        router._configs,
-                        text,
-                        self._compare,
-                        "output from %s" % (self._command),
-                    )
-                elif isinstance(self._compare, dict):
-                    diff = json_cmp(json.loads(text), self._compare)
-                    if diff is not None:
-                        result = TopotatoCLICompareFail(str(diff))
+                if text == last_text:
+                    result = last_result
+                else:
+                    last_text = text
+                    result = last_result = self._compare_text(router, text)
 
             if result is None:
                 out[-1].match_for.append(self)
                 break
         else:
             assert result is not None
+            if isinstance(result, json_cmp_result):
+                # diff text is only built here, not on every failed retry
+                result = TopotatoCLICompareFail(str(result))
             raise result
 
+    # pylint: disable=protected-access
+    def _compare_text(self, router, text):
+        result: Union[None, BaseException, json_cmp_result] = None
+        if isinstance(self._compare, type(None)):
+            pass
+        elif isinstance(self._compare, str):
+            for filterfn in self._filters:
+                text = filterfn(text)
+            result = text_rich_cmp(
+                router._configs,
+                text,
+                self._compare_lines,
+                "output from %s" % (self._command),
+            )
+        elif isinstance(self._compare, dict):
+            result = json_cmp(_json_loads(text), self._compare)
+        return result
+
     @property
     def command(self):
         return self._command
@@ -330,10 +440,33 @@ class ReconfigureFRR(AssertVtysh):
     _cmdprefix = "enable\nconfigure\n"
 
 
+@functools.lru_cache(maxsize=128)
+def _pkt_argtypes(pkt: Callable[..., bool]) -> Tuple[Type[Packet], ...]:
+    """
+    Get (and check) the packet layer types a packet match function takes.
+
+    Cached since the same match function is frequently used for multiple
+    :py:class:`AssertPacket` items, and getfullargspec() is not cheap.
+    """
+    argtypes = []
+    argspec = inspect.getfullargspec(pkt)
+    for arg in argspec.args[: len(argspec.args) - len(argspec.defaults or ())]:
+        if arg not in argspec.annotations:
+            raise TypeError("%r needs a type annotation for parameter %r" % (pkt, arg))
+        argtype = argspec.annotations[arg]
+        if not issubclass(argtype, Packet):
+            raise TypeError(
+                "%r argument %r (%r) is not a scapy.Packet subtype"
+                % (pkt, arg, argtype)
+            )
+        argtypes.append(argtype)
+    return tuple(argtypes)
+
+
 class AssertPacket(TimedMixin, TopotatoAssertion):
     _link: str
     _pkt: Any
-    _argtypes: List[Type[Packet]]
+    _argtypes: Tuple[Type[Packet], ...]
     _expect_pkt: bool
 
     matched: Optional[Any]
@@ -350,33 +483,25 @@ class AssertPacket(TimedMixin, TopotatoAssertion):
         self._expect_pkt = expect_pkt
         self.matched = None
 
-        self._argtypes = []
-        argspec = inspect.getfullargspec(self._pkt)
-        for arg in argspec.args[: len(argspec.args) - len(argspec.defaults or ())]:
-            if arg not in argspec.annotations:
-                raise TypeError(
-                    "%r needs a type annotation for parameter %r" % (self._pkt, arg)
-                )
-            argtype = argspec.annotations[arg]
-            if not issubclass(argtype, Packet):
-                raise TypeError(
-                    "%r argument %r (%r) is not a scapy.Packet subtype"
-                    % (self._pkt, arg, argtype)
-                )
-            self._argtypes.append(argtype)
+        self._argtypes = _pkt_argtypes(self._pkt)
 
     def __call__(self):
+        # this loop runs for every packet captured anywhere in the network
+        link = self._link
+        argtypes = self._argtypes
+        match = self._pkt
+
         for element in self.timeline.run_timing(self._timing):
             if not isinstance(element, TimedScapy):
                 continue
             pkt = element.pkt
-            if pkt.sniffed_on != self._link:
+            if pkt.sniffed_on != link:
                 continue
 
             args = []
             cur_layer = pkt
 
-            for argtype in self._argtypes:
+            for argtype in argtypes:
                 cur_layer = cur_layer.getlayer(argtype)
                 if cur_layer is None:
                     break
@@ -385,7 +510,7 @@ class AssertPacket(TimedMixin, TopotatoAssertion):
             if cur_layer is None:
                 continue
 
-            if self._pkt(*args):
+            if match(*args):
                 self.matched = pkt
                 element.match_for.append(self)
                 if not self._expect_pkt:
@@ -403,10 +528,9 @@ class AssertPacket(TimedMixin, TopotatoAssertion):
 
 
 class AssertLog(TimedMixin, TopotatoAssertion):
-    _rtr: str
+    _rtr: "toponom.Router"
     _daemon: str
-    _pkt: Any
-    _msg = Union[re.Pattern, str]
+    _msg: Union[re.Pattern, str]
 
     matched: Optional[Any]
 
@@ -424,18 +548,25 @@ class AssertLog(TimedMixin, TopotatoAssertion):
 
     @skiptrace
     def __call__(self):
+        # log messages arrive live through the timeline's event loop (FRR's
+        # zlog_live socket), no need for polling log files here
+
+        # plain strings are substring matches, compiled patterns are used
+        # as-is; decide once rather than per message
+        if isinstance(self._msg, re.Pattern):
+            regex, substr = self._msg, None
+        else:
+            regex, substr = None, self._msg
+
         for msg in self.timeline.run_timing(self._timing):
             if not isinstance(msg, LogMessage):
                 continue
 
-            text = msg.text
-            if isinstance(self._msg, re.Pattern):
-                m = self._msg.match(text)
-                if not m:
-                    continue
-            else:
-                if text.find(self._msg) == -1:
+            if regex is not None:
+                if not regex.match(msg.text):
                     continue
+            elif substr not in msg.text:
+                continue
 
             self.matched = msg
             msg.match_for.append(self)
@@ -451,7 +582,11 @@ class AssertLog(TimedMixin, TopotatoAssertion):
 class Delay(TimedMixin, TopotatoAssertion):
     @skiptrace
     def __call__(self):
-        for _ in self.timeline.run_timing(self._timing):
+        # nothing is looking at the events, so skip replaying the history
+        # that run_timing() would start with; still need to keep processing
+        # live events while waiting though
+        _, end = self._timing.evaluate()
+        for _ in self.timeline.run_iter(end):
             pass
 
 
@@ -552,13 +687,14 @@ class BackgroundCommand:
         def __call__(self):
             router = cast("topobase.CallableNS", self.instance.routers[self._rtr.name])
 
-            ifd = open("/dev/null", "rb")
+            # output goes to the child directly, so this needs to be a real
+            # file; SpooledTemporaryFile would roll over to disk on fileno()
             self._cmdobj.tmpfile = tmpfile = tempfile.TemporaryFile()
 
             self._cmdobj.proc = router.popen(
                 ["/bin/sh", "-c", self._cmdobj._cmd],
-                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-                stdin=ifd,
+                cwd=_basedir,
+                stdin=subprocess.DEVNULL,
                 stdout=tmpfile,
                 stderr=tmpfile,
             )
@@ -6,13 +6,19 @@ topotato is designed as a heavily custom extension to pytest.  The core
 aspects of this are defined in this module (:py:mod:`topotato.base`).
 """
 
+# the pytest item/collector classes here and the traceback/caller location
+# handling they rely on are tightly coupled, splitting them up would only
+# spread that across modules
+# pylint: disable=too-many-lines
+
 import os
+import sys
 import inspect
-from collections import OrderedDict
 import time
 import logging
 import string
 from enum import Enum
+from types import FrameType
 
 import typing
 from typing import (
@@ -20,10 +26,14 @@ from typing import (
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     Generator,
     Iterable,
+    Iterator,
     List,
+    NamedTuple,
     Optional,
+    Set,
     Tuple,
     Type,
     Union,
@@ -67,33 +77,59 @@ class _SkipTrace(set):
 
     Create an instance (cf. :py:data:`skiptrace`), then use that instance as
     decorator (without braces at the end!).
+
+    The code objects themselves are kept in the set (which also keeps them
+    alive), lookups should go through :py:attr:`codeids` since hashing and
+    comparing code objects walks their names and constants.
     """
 
+    codeids: Set[int]
+
+    def __init__(self):
+        super().__init__()
+        self.codeids = set()
+
     def __call__(self, origfn):
         fn = origfn
         while not hasattr(fn, "__code__") and hasattr(fn, "__func__"):
             fn = getattr(fn, "__func__")
         self.add(fn.__code__)
+        self.codeids.add(id(fn.__code__))
         return origfn
 
     def __repr__(self):
         # this is pretty much just for sphinx/autodoc
         return "<%s.%s>" % (self.__class__.__module__, self.__class__.__name__)
 
-    def get_callers(self) -> List[inspect.FrameInfo]:
+    def get_callers(self) -> Iterator[FrameType]:
         """
-        :return: the calling stack frames left after skipping over functions
-           annotated with this decorator.
+        :return: iterator over the calling stack frames left after skipping
+           over functions annotated with this decorator, innermost first.
+
+        This walks frames directly rather than using :py:func:`inspect.stack`,
+        which would look up source code context for every frame on the stack.
+        Frames further out are only visited as the caller advances the
+        iterator, so stopping early skips the rest of the (pytest) stack.
         """
-        stack = inspect.stack()
-        stack.pop(0)
+        # documented interface, the underscore only marks it as CPython
+        # implementation specific
+        # pylint: disable=protected-access
+        frame: Optional[FrameType] = sys._getframe(1)
+        codeids = self.codeids
 
-        while stack and stack[0].frame.f_code in self:
-            stack.pop(0)
+        while frame is not None and id(frame.f_code) in codeids:
+            frame = frame.f_back
 
-        if not stack:
+        if frame is None:
             raise IndexError("cannot locate caller")
-        return stack
+
+        return self._walk(frame)
+
+    @staticmethod
+    def _walk(frame: Optional[FrameType]) -> Iterator[FrameType]:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
 
 
 skiptrace = _SkipTrace()
@@ -114,6 +150,37 @@ to debug when a test fails.
 endtrace = _SkipTrace()
 
 
+class CodeLoc(NamedTuple):
+    """
+    Test source code location, cf. :py:attr:`TopotatoItem._codeloc`.
+
+    Field names match :py:class:`inspect.FrameInfo` for the parts used here
+    and in :py:func:`.hooks.pytest_topotato_failure` implementations.
+    """
+
+    frame: FrameType
+    filename: str
+    lineno: int
+    """
+    Line number at the time the location was recorded; the frame itself
+    continues executing, so its ``f_lineno`` moves on.
+    """
+
+
+class _FakeTraceback:
+    """
+    Stand-in for a traceback object pointing at a :py:class:`CodeLoc`, so
+    pytest shows where a test item was yielded from.
+    """
+
+    __slots__ = ("tb_frame", "tb_lineno", "tb_next")
+
+    def __init__(self, codeloc: CodeLoc, nexttb):
+        self.tb_frame = codeloc.frame
+        self.tb_lineno = codeloc.lineno
+        self.tb_next = nexttb
+
+
 class ItemGroup(list["TopotatoItem"]):
     """
     Return value of the :py:meth:`TopotatoItem.make` generators.
@@ -188,7 +255,7 @@ class TopotatoItem(nodes.Item):
 
     pretty: "PrettyItem"
 
-    _codeloc: Optional[inspect.FrameInfo]
+    _codeloc: Optional[CodeLoc]
     """
     Test source code location that resulted in the creation of this item.
     Filtered heavily to condense down useful information.
@@ -282,17 +349,17 @@ class TopotatoItem(nodes.Item):
         """
 
         callers = skiptrace.get_callers()
-        assert callers
 
         # ordering of test items is based on caller here, so we need to go
         # with the topmost or we end up reordering things in a weird way.
         location = ""
         caller = None
-        while callers:
-            module = inspect.getmodule(callers[0].frame)
-            if not module or module.__name__.startswith("topotato."):
+        for frame in callers:
+            # inspect.getmodule() would search sys.modules by filename
+            modname = frame.f_globals.get("__name__")
+            if not modname or modname.startswith("topotato."):
                 break
-            caller = callers.pop(0)
+            caller = CodeLoc(frame, frame.f_code.co_filename, frame.f_lineno)
             location = "#%d%s" % (caller.lineno, location)
         del callers
 
@@ -324,12 +391,14 @@ class TopotatoItem(nodes.Item):
         ``_topotato_makeitem`` method to call that instead.  This is the "core"
         pytest hook-in that makes all the other topotato objects appear.
         """
-        if hasattr(obj, "_topotato_makeitem"):
-            # pylint: disable=protected-access
-            if inspect.ismethod(obj._topotato_makeitem):
-                _logger.debug("_topotato_makeitem(%r, %r, %r)", collector, name, obj)
-                return obj._topotato_makeitem(collector, name, obj)
-            _logger.debug("%r._topotato_makeitem: not a method", obj)
+        # pylint: disable=protected-access
+        make = getattr(obj, "_topotato_makeitem", None)
+        if make is None:
+            return None
+        if inspect.ismethod(make):
+            _logger.debug("_topotato_makeitem(%r, %r, %r)", collector, name, obj)
+            return make(collector, name, obj)
+        _logger.debug("%r._topotato_makeitem: not a method", obj)
         return None
 
     def setup(self):
@@ -372,12 +441,11 @@ class TopotatoItem(nodes.Item):
         Return the location the test item was yield-generated from, rather
         than some place deep in the topotato logic.
         """
-        if self._codeloc is None:
+        codeloc = self._codeloc
+        if codeloc is None:
             return "???", 0, self.name
 
-        fspath = self._codeloc.filename
-        lineno = self._codeloc.lineno
-        return fspath, lineno, self.name
+        return codeloc.filename, codeloc.lineno, self.name
 
     # pytest < 7.4
     def _prunetraceback(self, excinfo: "ExceptionInfo[BaseException]") -> None:
@@ -390,19 +458,22 @@ class TopotatoItem(nodes.Item):
 
         tb = excinfo.traceback
         newtb: List["TracebackEntry"] = []
+        end_ids, skip_ids = endtrace.codeids, skiptrace.codeids
         for entry in reversed(tb):
             # pylint: disable=protected-access
-            if entry._rawentry.tb_frame.f_code in endtrace:
+            codeid = id(entry._rawentry.tb_frame.f_code)
+            if codeid in end_ids:
                 break
-            if entry._rawentry.tb_frame.f_code in skiptrace:
+            if codeid in skip_ids:
                 continue
             if newtb:
                 if hasattr(entry, "with_repr_style"):
                     entry = entry.with_repr_style("short")
                 elif hasattr(entry, "set_repr_style"):
                     entry.set_repr_style("short")
-            newtb.insert(0, entry)
+            newtb.append(entry)
 
+        newtb.reverse()
         return type(excinfo.traceback)(newtb)
 
     def _repr_failure(self, excinfo, style=None):
@@ -410,22 +481,17 @@ class TopotatoItem(nodes.Item):
         if reprcls:
             return reprcls(excinfo)
 
-        if getattr(self, "_codeloc", None) is None:
+        codeloc = self._codeloc
+        if codeloc is None:
             return super().repr_failure(excinfo)
 
         if isinstance(excinfo.value, _pytest.fixtures.FixtureLookupError):
             return excinfo.value.formatrepr()
 
-        class FakeTraceback:
-            def __init__(self, codeloc, nexttb):
-                self.tb_frame = codeloc.frame
-                self.tb_lineno = codeloc.lineno
-                self.tb_next = nexttb
-
         # pylint: disable=protected-access
         ftb = cast(
             "TracebackType",
-            FakeTraceback(self._codeloc, excinfo.traceback[0]._rawentry),
+            _FakeTraceback(codeloc, excinfo.traceback[0]._rawentry),
         )
         excinfo.traceback.insert(0, _pytest._code.code.TracebackEntry(ftb))
 
@@ -470,7 +536,7 @@ class TopotatoItem(nodes.Item):
             item=self,
             excinfo=excinfo,
             excrepr=res,
-            codeloc=getattr(self, "_codeloc", None),
+            codeloc=self._codeloc,
         )
         return res
 
@@ -527,8 +593,6 @@ class InstanceStartup(TopotatoItem):
 
     cascade_failures = SkipMode.SkipThisAndLaterHard
 
-    commands: OrderedDict
-
     def __init__(self, **kwargs):
         super().__init__(name="startup", **kwargs)
 
@@ -706,17 +770,37 @@ class TopotatoWrapped:
     up topotato test items for functions annotated this way.
     """
 
-    def __init__(self, wrap, call=None, *, kwds: Optional[Dict[str, Any]] = None):
-        assert inspect.isgeneratorfunction(wrap)
+    _argnames: FrozenSet[str]
+    """
+    Parameter names of the wrapped method, minus ``self``.  Determined once
+    on decoration and carried over to bound instances.
+    """
 
+    def __init__(
+        self,
+        wrap,
+        call=None,
+        *,
+        kwds: Optional[Dict[str, Any]] = None,
+        argnames: Optional[FrozenSet[str]] = None,
+    ):
         self._wrap = wrap
         self._call = call or wrap
         self.__wrapped__ = call or wrap
         self._kwds = kwds or {}
+        if argnames is None:
+            # initial decoration; bound copies from __get__ pass argnames on
+            # and were already checked
+            assert inspect.isgeneratorfunction(wrap)
+            argnames = frozenset(inspect.getfullargspec(wrap).args[1:])
+        self._argnames = argnames
 
     def __get__(self, obj, objtype=None):
         return self.__class__(
-            self._wrap, self._call.__get__(obj, objtype), kwds=self._kwds
+            self._wrap,
+            self._call.__get__(obj, objtype),
+            kwds=self._kwds,
+            argnames=self._argnames,
         )
 
     def __call__(self, *args, **kwargs):
@@ -797,8 +881,7 @@ class TopotatoFunction(nodes.Collector, _pytest.python.PyobjMixin):
         topo = tcls.obj._setup._network
 
         # pylint: disable=protected-access
-        argspec = inspect.getfullargspec(method._call).args[1:]
-        argnames = set(argspec)
+        argnames = method._argnames
 
         # all possible kwargs
         all_args = {}
@@ -834,6 +917,21 @@ class TopotatoFunction(nodes.Collector, _pytest.python.PyobjMixin):
         return tests
 
 
+class _TCNameTable(dict):
+    """
+    :py:meth:`str.translate` table for lcov test names, anything that is not
+    an ASCII letter or digit (including non-ASCII) becomes an underscore.
+    """
+
+    def __missing__(self, key):
+        return "_"
+
+
+_tcname_table = _TCNameTable(
+    (ord(ch), ch) for ch in string.ascii_letters + string.digits
+)
+
+
 # false warning on get_closest_marker()
 # pylint: disable=abstract-method
 class TopotatoClass(_pytest.python.Class):
@@ -876,6 +974,11 @@ class TopotatoClass(_pytest.python.Class):
         for fixture in getattr(self._obj, "use", []):
             self.add_marker(pytest.mark.usefixtures(fixture))
 
+        # startup, tests and shutdown share one network instance and must
+        # run in order in one process.  pytest-xdist honors this with
+        # "--dist loadgroup"; otherwise test classes get split up.
+        self.add_marker(pytest.mark.xdist_group(name=self.nodeid))
+
         return self
 
     def newinstance(self):
@@ -918,10 +1021,7 @@ class TopotatoClass(_pytest.python.Class):
 
         netinst = self.netinst
 
-        tcname = self.nodeid
-        tcname = "".join(
-            ch if ch in string.ascii_letters + string.digits else "_" for ch in tcname
-        )
+        tcname = self.nodeid.translate(_tcname_table)
         netinst.lcov_args.extend(  # type: ignore[attr-defined]
             [
                 "-t",
@@ -25,6 +25,9 @@ if typing.TYPE_CHECKING:
     import subprocess
 
 
+# exabgp processes are run from the topotato package directory
+_basedir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 jenv = Environment(
     line_comment_prefix="#" + "#",
     line_statement_prefix="#" + "%",
@@ -163,7 +166,7 @@ class ExaBGP:
                     "--env",
                     os.path.join(path, "exabgp.env"),
                 ],
-                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                cwd=_basedir,
             )
 
             self.is_cli_ok()
@@ -181,7 +184,7 @@ class ExaBGP:
                     "--env",
                     os.path.join(path, "exabgp.env"),
                 ],
-                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                cwd=_basedir,
             )
 
             self.is_bgp_daemon_running()
@@ -209,7 +212,7 @@ class ExaBGP:
                     os.path.join(path, "exabgp.env"),
                     self._cmd,
                 ],
-                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                cwd=_basedir,
             )
 
             self.is_cli_ok()
@@ -223,7 +226,7 @@ class ExaBGP:
             path = self._cmdobj.path
             self._cmdobj.proc_cli = router.popen(
                 ["exabgpcli", "--root", path, "shutdown"],
-                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                cwd=_basedir,
             )
 
             self.is_cli_ok()
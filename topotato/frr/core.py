@@ -409,7 +409,14 @@ class VtyshPoll(MiniPollee):
     daemon: str
 
     _cur_cmd: Optional[str]
-    _cur_out: Optional[bytes]
+    _cur_out: Optional[bytearray]
+
+    recv_size = 65536
+    """
+    Read size per ``recv()``.  Large ``show`` output (full route tables,
+    LSDBs) otherwise takes dozens of wakeups and bytes concatenations to
+    collect.
+    """
 
     def __init__(self, rtrname: str, daemon: str, sock: socket.socket, cmds: List[str]):
         self.rtrname = rtrname
@@ -426,7 +433,7 @@ class VtyshPoll(MiniPollee):
             return
 
         self._cur_cmd = cmd = self._cmds.pop(0)
-        self._cur_out = b""
+        self._cur_out = bytearray()
 
         self._sock.setblocking(True)
         self._sock.sendall(cmd.strip().encode("UTF-8") + b"\0")
@@ -440,7 +447,7 @@ class VtyshPoll(MiniPollee):
         assert self._cur_cmd is not None
         assert self._cur_out is not None
 
-        self._cur_out += self._sock.recv(4096)
+        self._cur_out += self._sock.recv(self.recv_size)
 
         if len(self._cur_out) >= 4 and self._cur_out[-4:-1] == b"\0\0\0":
             rc = self._cur_out[-1]
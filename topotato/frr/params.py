@@ -250,7 +250,18 @@ class FRRParams(TopotatoParams):
             if not hasattr(cls, daemon):
                 continue
 
-            cls.templates[daemon] = jenv.compile_class_attr(cls, daemon)
+            # templates inherited unchanged from a parent config class were
+            # already compiled there
+            owner = next(base for base in cls.__mro__ if daemon in base.__dict__)
+            if (
+                owner is not cls
+                # mixins can carry templates too, those aren't compiled
+                and issubclass(owner, FRRParams)
+                and daemon in owner.__dict__.get("templates", {})
+            ):
+                cls.templates[daemon] = owner.templates[daemon]
+            else:
+                cls.templates[daemon] = jenv.compile_class_attr(cls, daemon)
             cls.daemon_rtrs[daemon] = getattr(cls, "%s_routers" % daemon, all_routers)
 
         return cls
@@ -5,6 +5,7 @@
 Jinja2 templating for FRR configurations.
 """
 
+import os
 from dataclasses import dataclass
 import typing
 from typing import (
@@ -26,6 +27,10 @@ if typing.TYPE_CHECKING:
 
 jenv = jinlinja.InlineEnv()
 
+# allow templates to turn on optional bits (e.g. verbose debugs) with
+# environment variables, as "#% if env.SOME_VARIABLE"
+jenv.globals["env"] = os.environ
+
 # TBD: might be more accessible to just put these in a templates/ dir
 _templates = {
     "boilerplate.conf": """
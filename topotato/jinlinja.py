@@ -10,6 +10,7 @@ Jinja2 python-inline template helpers
 import sys
 import inspect
 import ast
+import functools
 from typing import (
     Any,
     Dict,
@@ -31,33 +32,45 @@ class _ConstFinder(ast.NodeVisitor):
     Parses the python source using the ast module and tries to find a string
     constant with a matching value.  Unfortunately, there's no better way to
     get source locations for inline jinja2 templates.
+
+    A module usually holds several templates (one per daemon, in possibly
+    several classes), so the string constants in a source file are indexed
+    once and the parse result reused for all lookups in the same source.
     """
 
-    _search: str
-    _found: List[ast.Constant]
+    _found: Dict[str, List[ast.Constant]]
 
-    def __init__(self, search: str):
-        self._search = search
-        self._found = []
+    def __init__(self):
+        self._found = {}
 
     def visit_Constant(self, node: ast.Constant):
-        if node.value == self._search:
-            self._found.append(node)
+        if isinstance(node.value, str):
+            self._found.setdefault(node.value, []).append(node)
 
-    def _reframe(self, filename: str) -> Tuple[Optional[str], str]:
+    @classmethod
+    @functools.lru_cache(maxsize=32)
+    def _index(cls, src: str, filename: str) -> Dict[str, List[ast.Constant]]:
+        self = cls()
+        self.generic_visit(ast.parse(src, filename))
+        return self._found
+
+    @staticmethod
+    def _reframe(
+        found: List[ast.Constant], filename: str, text: str
+    ) -> Tuple[Optional[str], str]:
         """
         Realign the search text to match the source location found, if any.
 
         This just adds a bunch of '##-' comment lines to make line numbers
         match up with where the text was found.
         """
-        if len(self._found) != 1:
-            return None, self._search
+        if len(found) != 1:
+            return None, text
 
-        node = self._found[0]
+        node = found[0]
         return (
             filename,
-            (node.lineno - 1) * "##-\n" + (node.col_offset + 3) * " " + self._search,
+            (node.lineno - 1) * "##-\n" + (node.col_offset + 3) * " " + text,
         )
 
     @classmethod
@@ -67,9 +80,8 @@ class _ConstFinder(ast.NodeVisitor):
 
         May return (None, text) if the template cannot be found.
         """
-        self = cls(text)
-        self.generic_visit(ast.parse(src, filename))
-        return self._reframe(filename)
+        found = cls._index(src, filename).get(text, [])
+        return cls._reframe(found, filename, text)
 
 
 class InlineEnv(jinja2.Environment):
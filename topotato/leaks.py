@@ -15,6 +15,7 @@ import itertools
 
 from typing import (
     Dict,
+    Iterable,
     Optional,
     Set,
     Tuple,
@@ -27,6 +28,24 @@ _types = {int(getattr(socket, n)): n for n in _types_s if hasattr(socket, n)}
 _ipprotos = {
     int(getattr(socket, n)): n for n in dir(socket) if n.startswith("IPPROTO_")
 }
+_nlprotos = {
+    int(getattr(socket, n)): n for n in dir(socket) if n.startswith("NETLINK_")
+}
+
+# protocol number -> name, by address family
+_protos_by_af = {
+    int(socket.AF_INET): _ipprotos,
+    int(socket.AF_INET6): _ipprotos,
+}
+if hasattr(socket, "AF_NETLINK"):
+    _protos_by_af[int(socket.AF_NETLINK)] = _nlprotos
+
+_basic_kinds = {
+    "file": stat.S_ISREG,
+    "dir": stat.S_ISDIR,
+    "chardev": stat.S_ISCHR,
+    "blkdev": stat.S_ISBLK,
+}
 
 if sys.platform == "linux":
     from .nswrap import getnstype
@@ -37,6 +56,51 @@ else:
         return None
 
 
+_nstype_cache: Dict[Tuple[int, int, Optional[str]], Optional[str]] = {}
+_nstype_cache_max = 4096
+
+
+def _nstype(fd: int, st: os.stat_result, fdlink: Optional[str]) -> Optional[str]:
+    """
+    Namespace type lookup, cached on (dev, ino) since that identifies the
+    namespace (or other file) regardless of which fd number it is open on.
+
+    nsfs inode numbers can be reused by a later namespace of a different
+    type, so the link target (e.g. ``net:[4026531840]``, which includes
+    the type) is part of the key too.
+    """
+    key = (st.st_dev, st.st_ino, fdlink)
+    try:
+        return _nstype_cache[key]
+    except KeyError:
+        pass
+
+    if len(_nstype_cache) >= _nstype_cache_max:
+        _nstype_cache.clear()
+    _nstype_cache[key] = nstype = getnstype(fd)
+    return nstype
+
+
+def _fd_list() -> Optional[Iterable[int]]:
+    """
+    List open fds from ``/proc/self/fd`` if available.
+
+    The fd used to read the directory itself shows up in the listing; it is
+    closed by the time the caller looks at it and fails with EBADF there.
+
+    listdir() already reads the directory in large getdents64 batches; the
+    remaining cost is one fstat() per fd, which there is no way to batch
+    from Python short of pulling in io_uring bindings.  Not worth it for a
+    few hundred fds.
+    """
+    try:
+        names = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    # order is irrelevant, FDState is a dict and FDDelta works on sets
+    return (int(name) for name in names)
+
+
 def _hexbytes(i):
     if not isinstance(i, bytes):
         return i
@@ -90,7 +154,7 @@ def fdinfo(fd: int) -> str:
 
     extrastr = "".join(extra)
 
-    nstype = getnstype(fd)
+    nstype = _nstype(fd, st, fdlink)
 
     try:
         if stat.S_ISSOCK(st.st_mode):
@@ -106,10 +170,7 @@ def fdinfo(fd: int) -> str:
                 sockname = _socknamewrap(s.getsockname)
                 peername = _socknamewrap(s.getpeername)
 
-            if af in {socket.AF_INET, socket.AF_INET6}:
-                protostr = _ipprotos.get(protocol, str(protocol))
-            else:
-                protostr = str(protocol)
+            protostr = _protos_by_af.get(af, {}).get(protocol, str(protocol))
 
             return f"socket({_afs.get(af, str(af))}, {_types.get(typ, str(typ))}, {protostr}, sockname={sockname}, peername={peername}{extrastr})"
 
@@ -117,13 +178,7 @@ def fdinfo(fd: int) -> str:
             major, minor = st.st_dev >> 8, st.st_dev & 0xFF
             return f"nsfd({nstype}, dev={major}:{minor}, inode={st.st_ino}, mode={stat.S_IMODE(st.st_mode):#o}{extrastr})"
 
-        basic = {
-            "file": stat.S_ISREG,
-            "dir": stat.S_ISDIR,
-            "chardev": stat.S_ISCHR,
-            "blkdev": stat.S_ISBLK,
-        }
-        for kind, test in basic.items():
+        for kind, test in _basic_kinds.items():
             if test(st.st_mode):
                 major, minor = st.st_dev >> 8, st.st_dev & 0xFF
                 return f"{kind}(dev={major}:{minor}, inode={st.st_ino}, mode={stat.S_IMODE(st.st_mode):#o}{extrastr})"
@@ -147,6 +202,8 @@ class FDState(Dict[int, Tuple[int, int, int]]):
     and dev/ino numbers to compare.
     """
 
+    __slots__ = ()
+
     stop_after = 256
 
     @staticmethod
@@ -156,6 +213,16 @@ class FDState(Dict[int, Tuple[int, int, int]]):
     def __init__(self):
         super().__init__()
 
+        fds = _fd_list()
+        if fds is not None:
+            for fd in fds:
+                try:
+                    self[fd] = self._key(os.fstat(fd))
+                except OSError as e:
+                    if e.errno != errno.EBADF:
+                        raise
+            return
+
         stop = 0
         for fd in itertools.count():
             st = None
@@ -187,14 +254,12 @@ class FDDelta:
         self.before = before
         self.after = after
 
-        k1 = set(before.keys())
-        k2 = set(after.keys())
+        # dict key views support set operations directly, no need to copy
+        k1 = before.keys()
+        k2 = after.keys()
         self.opened = k2 - k1
         self.closed = k1 - k2
-        self.changed = set()
-        for fd in k1 & k2:
-            if before[fd] != after[fd]:
-                self.changed.add(fd)
+        self.changed = {fd for fd in k1 & k2 if before[fd] != after[fd]}
 
     def __len__(self):
         """
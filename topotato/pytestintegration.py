@@ -68,9 +68,14 @@ def pytest_addoption(parser):
     )
 
 
-# @pytest.hookimpl()
-# def pytest_configure(config):
-#    pass
+@pytest.hookimpl()
+def pytest_configure(config):
+    # also registered by pytest-xdist itself, but needs to be known without
+    # xdist installed, otherwise --strict-markers fails
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): run all items in the group on the same xdist worker",
+    )
 
 
 @pytest.hookimpl()
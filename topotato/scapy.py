@@ -24,8 +24,8 @@ if typing.TYPE_CHECKING:
 _logger = logging.getLogger(__name__)
 
 try:
-    # pylint: disable=no-name-in-module
-    from scapy.all import Ether  # type: ignore
+    # scapy.all is deferred until the network is started, cf. topolinux
+    from scapy.layers.l2 import Ether  # type: ignore
     from .scapyext import NetnsL2Socket
 
     scapy_exc = None
@@ -258,6 +258,26 @@ class SwitchyNS(BaseNS):
     """
 
 
+class RouteMonitor(ABC):
+    """
+    Kernel routing table change notifications, cf.
+    :py:meth:`RouterNS.route_monitor`.
+    """
+
+    @abstractmethod
+    def changed(self) -> bool:
+        """
+        Check (without blocking) whether the routing table changed since
+        the last call, or since creating the monitor for the first call.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Stop listening for changes.
+        """
+
+
 class RouterNS(BaseNS):
     """
     Virtual router or host of some type in this network instance.
@@ -293,6 +313,17 @@ class RouterNS(BaseNS):
         """
         return {}
 
+    def route_monitor(
+        self, af: Union[Literal[4], Literal[6]] = 4
+    ) -> Optional["RouteMonitor"]:
+        """
+        Get notified about kernel routing table changes on this system.
+
+        Returns None if not supported, callers then need to fall back to
+        just polling :py:meth:`routes`.
+        """
+        return None
+
     def link_set(self, iface: "toponom.LinkIface", state: bool) -> None:
         """
         Set one of this systems interfaces up or down.
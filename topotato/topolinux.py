@@ -8,6 +8,11 @@ Linux implementation of topotato instances, based on nswrap
 
 import json
 import os
+import errno
+import fcntl
+import importlib
+import socket
+import struct
 import sys
 import shlex
 import re
@@ -38,8 +43,11 @@ import scapy.arch  # type: ignore[import-untyped]
 #   ("Could not retrieve the OS's nameserver !")
 scapy.arch.read_nameservers = lambda: []
 
+# NB: "import scapy.all" is deferred to starting the network.  It takes the
+# better part of a second and is only needed so all protocol layers are
+# registered by the time packets get captured & dissected.  Test collection
+# and the selftests don't need it.
 # pylint: disable=wrong-import-position
-import scapy.all  # type: ignore[import-untyped]
 import scapy.config  # type: ignore[import-untyped]
 
 from .defer import subprocess
@@ -51,6 +59,46 @@ from . import topobase
 
 _logger = logging.getLogger(__name__)
 
+# linux/rtnetlink.h, not exported by the socket module
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_ROUTE = 0x400
+
+# linux/sockios.h, linux/if.h
+SIOCGIFFLAGS = 0x8913
+SIOCSIFFLAGS = 0x8914
+IFF_UP = 0x1
+
+# struct ifreq with ifr_flags; the kernel always copies the full 40 bytes
+_ifreq_flags = struct.Struct("16sH22x")
+
+
+class RouteMonitor(topobase.RouteMonitor):
+    """
+    netlink socket subscribed to route change notifications
+
+    The notifications themselves aren't parsed, they only serve to tell
+    whether it's worth dumping the routing table again.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+
+    def changed(self) -> bool:
+        changed = False
+        while True:
+            try:
+                self._sock.recv(65536)
+            except BlockingIOError:
+                return changed
+            except OSError as e:
+                # socket buffer overrun, we lost some notifications
+                if e.errno != errno.ENOBUFS:
+                    raise
+            changed = True
+
+    def close(self):
+        self._sock.close()
+
 
 def ifname(host: str, iface: str) -> str:
     """
@@ -182,6 +230,10 @@ class NetworkInstance(topobase.NetworkInstance):
 
             def add(arr):
                 for route in arr:
+                    # only present when listing "table all"
+                    table = route.pop("table", "main")
+                    if table not in ("main", "local"):
+                        continue
                     dst = route["dst"]
                     if dst == "default":
                         dst = "0.0.0.0/0"
@@ -189,20 +241,17 @@ class NetworkInstance(topobase.NetworkInstance):
                         dst = dst + ("/32" if af == 4 else "/128")
                     ret.setdefault(dst, []).append(route)
 
-            def ip_r_call(extra=None):
-                text = self.check_output(
-                    [self._exec("ip"), "-%d" % af, "-j", "route", "list"]
-                    + (extra or [])
-                )
-                text = self.iproute_json_re.sub(rb'"type":"\1"', text)
-                try:
-                    return json.loads(text)
-                except json.decoder.JSONDecodeError as e:
-                    raise SystemError("invalid JSON from iproute2: %r" % text) from e
-
-            add(ip_r_call())
-            if local:
-                add(ip_r_call(["table", "local"]))
+            # with local routes, grab main + local table in one go rather
+            # than running ip twice
+            text = self.check_output(
+                [self._exec("ip"), "-%d" % af, "-j", "route", "list"]
+                + (["table", "all"] if local else [])
+            )
+            text = self.iproute_json_re.sub(rb'"type":"\1"', text)
+            try:
+                add(json.loads(text))
+            except json.decoder.JSONDecodeError as e:
+                raise SystemError("invalid JSON from iproute2: %r" % text) from e
 
             for net in list(ret.keys()):
                 if net.startswith("fe80:") or net.startswith("ff00:"):
@@ -210,6 +259,30 @@ class NetworkInstance(topobase.NetworkInstance):
 
             return ret
 
+        def route_monitor(
+            self, af: Union[Literal[4], Literal[6]] = 4
+        ) -> "RouteMonitor":
+            """
+            subscribe to IPvX kernel route changes in this namespace
+
+            The socket is opened inside the namespace, after that it keeps
+            listening there regardless of which namespace we're in.
+            """
+            assert af in [4, 6]
+
+            with self:
+                sock = socket.socket(
+                    socket.AF_NETLINK,
+                    socket.SOCK_RAW | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC,
+                    socket.NETLINK_ROUTE,
+                )
+            try:
+                sock.bind((0, RTMGRP_IPV4_ROUTE if af == 4 else RTMGRP_IPV6_ROUTE))
+            except OSError:
+                sock.close()
+                raise
+            return RouteMonitor(sock)
+
         def status(self):
             print("##### status for %s #####" % self.name)
             self.check_call(
@@ -338,16 +411,18 @@ class NetworkInstance(topobase.NetworkInstance):
             assert iface.ifname is not None
             assert self.instance.switch_ns is not None
 
-            ifn = ifname(self.name, iface.ifname)
-            self.instance.switch_ns.check_call(
-                [
-                    self._exec("ip"),
-                    "link",
-                    "set",
-                    ifn,
-                    "up" if state else "down",
-                ]
-            )
+            ifn = ifname(self.name, iface.ifname).encode("UTF-8")
+
+            # same as "ip link set ... up/down", minus the fork+exec; device
+            # ioctls operate in the namespace the socket was created in
+            with self.instance.switch_ns:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, 0)
+
+            with sock:
+                ifreq = fcntl.ioctl(sock, SIOCGIFFLAGS, _ifreq_flags.pack(ifn, 0))
+                _, flags = _ifreq_flags.unpack(ifreq)
+                flags = (flags | IFF_UP) if state else (flags & ~IFF_UP)
+                fcntl.ioctl(sock, SIOCSIFFLAGS, _ifreq_flags.pack(ifn, flags))
 
     network: Network
     switch_ns: Optional[SwitchyNS]
@@ -483,6 +558,9 @@ class NetworkInstance(topobase.NetworkInstance):
                     ]
                 )
 
+        # only imported for the side effect of registering all layers
+        importlib.import_module("scapy.all")
+
         self.scapys = {}
         args = []
 
@@ -8,6 +8,7 @@ Network object model representation
 import ipaddress
 import re
 import binascii
+import functools
 from itertools import chain
 
 import abc
@@ -176,11 +177,14 @@ class NOMLinked(NOMNode, metaclass=abc.ABCMeta):
     num_explicit: Optional[int]
     dotname: str
 
+    _ifaces_by_other: Optional[Dict[str, List["LinkIface"]]]
+
     def __init__(self, network):
         super().__init__(network)
         self.ifaces = []
         self.num_default = -1
         self.num_explicit = None
+        self._ifaces_by_other = None
 
     def __lt__(self, other):
         return self.sortkey < other.sortkey
@@ -195,6 +199,7 @@ class NOMLinked(NOMNode, metaclass=abc.ABCMeta):
 
     def add_iface(self, iface):
         self.ifaces.append(iface)
+        self._ifaces_by_other = None
 
     def auto_ifnames(self):
         for i in self.ifaces:
@@ -219,7 +224,14 @@ class NOMLinked(NOMNode, metaclass=abc.ABCMeta):
         """
         get all the interfaces of this node that go to "other"
         """
-        return [i for i in self.ifaces if i.other.endpoint.name == other]
+        # iface_to() is used a lot in templates and tests, index once
+        if self._ifaces_by_other is None:
+            index: Dict[str, List["LinkIface"]] = {}
+            for i in self.ifaces:
+                index.setdefault(i.other.endpoint.name, []).append(i)
+            self._ifaces_by_other = index
+
+        return list(self._ifaces_by_other.get(other, ()))
 
     def iface_to(self, other: str) -> "LinkIface":
         """
@@ -557,13 +569,27 @@ class LinkIface(NOMNode):
                 iface = ipaddress.IPv6Interface("%s/%d" % (str(addr), net.prefixlen))
                 self.ip6.append(iface)
 
-    @property
-    def ll6(self):
+    @functools.cached_property
+    def _ll6(self) -> Tuple[ipaddress.IPv6Address, str]:
+        # the MAC address is only assigned once (and self.macaddr raises
+        # before that), so this can't go stale
         mac = self.macaddr.replace(":", "")
         eui = bytearray(binascii.a2b_hex("".join([mac[:6], "fffe", mac[6:]])))
         eui[0] ^= 0x2
         addr = binascii.a2b_hex("fe80000000000000") + eui
-        return ipaddress.IPv6Address(bytes(addr))
+        ll6 = ipaddress.IPv6Address(bytes(addr))
+        return ll6, str(ll6)
+
+    @property
+    def ll6(self) -> ipaddress.IPv6Address:
+        return self._ll6[0]
+
+    @property
+    def ll6_str(self) -> str:
+        """
+        Same as ``str(self.ll6)``, for use in JSON compare dicts.
+        """
+        return self._ll6[1]
 
 
 class Link(NOMNode):
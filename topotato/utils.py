@@ -174,19 +174,43 @@ class json_cmp_result:
     "json_cmp result class for better assertion messages"
 
     def __init__(self):
-        self.errors = []
+        self._errors = []
+        self._lines: Optional[List[str]] = None
 
-    def add_error(self, error):
-        "Append error message to the result"
-        for line in error.splitlines():
-            self.errors.append(line)
+    def add_error(self, error, *args):
+        """
+        Append error message to the result.
+
+        If args are given, error is a format string that is only filled in
+        when the message is actually looked at.  Most compares fail a number
+        of times while waiting for a daemon to converge, and the JSON diffs
+        for the messages are expensive to produce.
+        """
+        self._errors.append((error, args))
+        self._lines = None
+
+    def _format(self) -> List[str]:
+        # formatted once, results nested in list compares can be looked at
+        # repeatedly
+        if self._lines is None:
+            lines = []
+            for error, args in self._errors:
+                if args:
+                    error = error.format(*args)
+                lines.extend(error.splitlines())
+            self._lines = lines
+        return self._lines
+
+    @property
+    def errors(self):
+        return list(self._format())
 
     def has_errors(self):
         "Returns True if there were errors, otherwise False."
-        return len(self.errors) > 0
+        return len(self._errors) > 0
 
     def __str__(self):
-        return "\n".join(self.errors)
+        return "\n".join(self._format())
 
 
 # used with an "isinstance"/"is" comparison
@@ -213,8 +237,17 @@ class JSONCompareDirective(dict):
 class JSONCompareIgnoreContent(JSONCompareDirective):
     """
     Ignore list/dict content in JSON compare.
+
+    This carries no state, so all calls return the same instance.
     """
 
+    _instance: Optional["JSONCompareIgnoreContent"] = None
+
+    def __new__(cls):
+        if cls.__dict__.get("_instance") is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
 
 class JSONCompareIgnoreExtraListitems(JSONCompareDirective):
     """
@@ -257,6 +290,38 @@ class JSONCompareUnexpectedDirective(TypeError):
     """
 
 
+class _LazyStr:
+    """
+    Placeholder for some expensive string in :py:class:`json_cmp_result`
+    error messages, only produced when the message is formatted.
+    """
+
+    __slots__ = ["fn", "args", "text"]
+
+    text: Optional[str]
+
+    def __init__(self, fn, *args):
+        self.fn = fn
+        self.args = args
+        self.text = None
+
+    def __str__(self):
+        if self.text is None:
+            self.text = self.fn(*self.args)
+        return self.text
+
+
+def _indent(res):
+    return str(res).replace("\n", "\n  ")
+
+
+def _json_best_err(candidates: List[json_cmp_result]) -> str:
+    """
+    Closest mismatch for a list item, going by shortest error message.
+    """
+    return _indent(min(candidates, key=lambda res: len(str(res)), default=None))
+
+
 def _json_diff(d1, d2):
     """
     Returns a string with the difference between JSON data.
@@ -275,6 +340,51 @@ def _json_diff(d1, d2):
     )
 
 
+_json_scalar_types = (str, int, float)
+"""
+Types that compare by plain equality in :py:func:`json_cmp` (bool is a
+subclass of int.)  None is excluded since it means "key must not exist".
+"""
+
+
+def _json_list_index(
+    list1: List[Any], keys: Tuple[Union[int, str], ...]
+) -> Dict[Tuple[Any, ...], List[Dict[Any, Any]]]:
+    """
+    Index dict items in a list by their values for the given keys.
+    """
+    index: Dict[Tuple[Any, ...], List[Dict[Any, Any]]] = {}
+    for value in list1:
+        if not isinstance(value, dict):
+            continue
+        try:
+            index.setdefault(tuple(value.get(key) for key in keys), []).append(value)
+        except TypeError:
+            # unhashable (dict/list) values can't match a plain value anyway
+            pass
+    return index
+
+
+def _json_list_keymatch(
+    list1: List[Any], keys: Tuple[Union[int, str], ...], expected: Dict[Any, Any]
+) -> List[Dict[Any, Any]]:
+    """
+    Find dict items in a list matching expected on given keys, the slow way.
+    """
+    keymatch = []
+    for value in list1:
+        if not isinstance(value, dict):
+            continue
+        for key in keys:
+            if key not in expected:
+                continue
+            if json_cmp({"_": value.get(key)}, {"_": expected[key]}) is not None:
+                break
+        else:
+            keymatch.append(value)
+    return keymatch
+
+
 # pylint: disable=too-many-locals,too-many-branches
 def _json_list_cmp(list1, list2, parent, result: json_cmp_result) -> None:
     "Handles list type entries."
@@ -286,58 +396,59 @@ def _json_list_cmp(list1, list2, parent, result: json_cmp_result) -> None:
     # Check second list2 type
     if not isinstance(list1, type([])) or not isinstance(list2, type([])):
         result.add_error(
-            "{} has different type than expected ".format(parent)
-            + "(have {}, expected {}):\n{}".format(
-                type(list1), type(list2), _json_diff(list1, list2)
-            )
+            "{} has different type than expected (have {}, expected {}):\n{}",
+            parent,
+            type(list1),
+            type(list2),
+            _LazyStr(_json_diff, list1, list2),
         )
         return
 
-    flags: List[Dict[Type[JSONCompareDirective], JSONCompareDirective]] = [{}, {}]
-    # don't modify input list with l.pop(0) below...
-    list1 = list1[:]
-    list2 = list2[:]
-    process: List[Tuple[int, List[Any]]] = [(0, list1), (1, list2)]
-
-    for i, l in process:
-        while l and isinstance(l[0], JSONCompareDirective):
-            item = l.pop(0)
-            flags[i][type(item)] = item
-
     # flags should only be in list2 for the time being
-    assert not flags[0]
+    assert not (list1 and isinstance(list1[0], JSONCompareDirective))
+
+    # neither input is modified; the received list isn't copied at all (it
+    # can be large, and this runs on every poll), the expected one only if
+    # it has leading directives
+    flags: Dict[Type[JSONCompareDirective], JSONCompareDirective] = {}
+    ndirectives = 0
+    item: Any
+    for item in list2:
+        if not isinstance(item, JSONCompareDirective):
+            break
+        flags[type(item)] = item
+        ndirectives += 1
+    if ndirectives:
+        list2 = list2[ndirectives:]
 
     # Check list size
     if len(list2) > len(list1):
-        # and JSONCompareIgnoreExtraListitems not in flags[0]:
+        # and JSONCompareIgnoreExtraListitems not in flags:
         result.add_error(
-            "{} too few items ".format(parent)
-            + "(have {}, expected {}:\n {})".format(
-                len(list1), len(list2), _json_diff(list1, list2)
-            )
+            "{} too few items (have {}, expected {}:\n {})",
+            parent,
+            len(list1),
+            len(list2),
+            _LazyStr(_json_diff, list1, list2),
         )
         return
 
     # List all unmatched items errors
-    if JSONCompareListKeyedDict in flags[1]:
-        keys = cast(JSONCompareListKeyedDict, flags[1][JSONCompareListKeyedDict]).keying
+    if JSONCompareListKeyedDict in flags:
+        keys = cast(JSONCompareListKeyedDict, flags[JSONCompareListKeyedDict]).keying
+        index = None
+
         for expected in cast(List[Dict[Any, Any]], list2):
             assert isinstance(expected, dict)
 
-            keymatch = []
-            for value in cast(List[Dict[Any, Any]], list1):
-                if not isinstance(value, dict):
-                    continue
-                for key in keys:
-                    if key not in expected:
-                        continue
-                    if (
-                        json_cmp({"_": value.get(key)}, {"_": expected[key]})
-                        is not None
-                    ):
-                        break
-                else:
-                    keymatch.append(value)
+            # common case: all keys given as plain values, look up directly
+            # instead of running json_cmp on each key of each item
+            if all(isinstance(expected.get(key), _json_scalar_types) for key in keys):
+                if index is None:
+                    index = _json_list_index(list1, keys)
+                keymatch = index.get(tuple(expected[key] for key in keys), [])
+            else:
+                keymatch = _json_list_keymatch(list1, keys, expected)
 
             keylabel = ",".join(["%s=%r" % (key, expected.get(key)) for key in keys])
             if not keymatch:
@@ -348,25 +459,27 @@ def _json_list_cmp(list1, list2, parent, result: json_cmp_result) -> None:
                 res = json_cmp(keymatch[0], expected)
                 if res is not None:
                     result.add_error(
-                        "{} value for key {} is different (\n  {})".format(
-                            parent, keylabel, str(res).replace("\n", "\n  ")
-                        )
+                        "{} value for key {} is different (\n  {})",
+                        parent,
+                        keylabel,
+                        _LazyStr(_indent, res),
                     )
     else:
         # unmatched = []
+        value: Any
         for expected in list2:
-            best_err = None
+            candidates: List[json_cmp_result] = []
             for value in list1:
                 res = json_cmp({"json": value}, {"json": expected})
                 if res is None:
                     break
-                if best_err is None or len(str(res)) < len(str(best_err)):
-                    best_err = res
+                candidates.append(res)
             else:
+                # only format the candidates' diffs if nothing matched
                 result.add_error(
-                    "{} list value is different (\n  {})".format(
-                        parent, str(best_err).replace("\n", "\n  ")
-                    )
+                    "{} list value is different (\n  {})",
+                    parent,
+                    _LazyStr(_json_best_err, candidates),
                 )
 
         # If there are unmatched items, error out.
@@ -404,18 +517,22 @@ def json_cmp(d1, d2):
         diff = s2_req - s1
         if diff != set({}):
             result.add_error(
-                "expected key(s) {} in {} (have {}):\n{}".format(
-                    str(list(diff)), parent, str(list(s1)), _json_diff(nd1, nd2)
-                )
+                "expected key(s) {} in {} (have {}):\n{}",
+                list(diff),
+                parent,
+                list(s1),
+                _LazyStr(_json_diff, nd1, nd2),
             )
 
         for key in s2.intersection(s1):
             # Test for non existence of key in d2
             if nd2[key] is None:
                 result.add_error(
-                    '"{}" should not exist in {} (have {}):\n{}'.format(
-                        key, parent, str(s1), _json_diff(nd1[key], nd2[key])
-                    )
+                    '"{}" should not exist in {} (have {}):\n{}',
+                    key,
+                    parent,
+                    s1,
+                    _LazyStr(_json_diff, nd1[key], nd2[key]),
                 )
                 continue
 
@@ -432,12 +549,13 @@ def json_cmp(d1, d2):
             if isinstance(nd2[key], type({})):
                 if not isinstance(nd1[key], type({})):
                     result.add_error(
-                        '{}["{}"] has different type than expected '.format(parent, key)
-                        + "(have {}, expected {}):\n{}".format(
-                            type(nd1[key]),
-                            type(nd2[key]),
-                            _json_diff(nd1[key], nd2[key]),
-                        )
+                        '{}["{}"] has different type than expected '
+                        "(have {}, expected {}):\n{}",
+                        parent,
+                        key,
+                        type(nd1[key]),
+                        type(nd2[key]),
+                        _LazyStr(_json_diff, nd1[key], nd2[key]),
                     )
                     continue
                 nparent = '{}["{}"]'.format(parent, key)
@@ -452,9 +570,10 @@ def json_cmp(d1, d2):
             # Compare JSON values
             if nd1[key] != nd2[key]:
                 result.add_error(
-                    '{}["{}"] dict value is different (\n{})'.format(
-                        parent, key, _json_diff(nd1[key], nd2[key])
-                    )
+                    '{}["{}"] dict value is different (\n{})',
+                    parent,
+                    key,
+                    _LazyStr(_json_diff, nd1[key], nd2[key]),
                 )
                 continue
 
@@ -464,9 +583,25 @@ def json_cmp(d1, d2):
     return None
 
 
-def text_rich_cmp(params, out, expect, outtitle):
-    lines = []
+RichCmpLines = List[Tuple[str, Union[str, "re.Pattern[str]"]]]
+
+
+def text_rich_compile(params, expect: str) -> RichCmpLines:
+    """
+    Preprocess expected text for :py:func:`text_rich_cmp`.
+
+    Each line is turned into a compiled regular expression, with ``$$...$$``
+    sections handled as regex and ``$$=...$$`` evaluated through ``params``.
+    Lines without any ``$$`` are kept as plain strings and compared directly.
+    The result can be reused for repeated comparisons against the same
+    expectation (e.g. when retrying an assertion.)
+    """
+    lines: RichCmpLines = []
     for line in deindent(expect).split("\n"):
+        if "$$" not in line:
+            lines.append((line, line))
+            continue
+
         items = line.split("$$")
         lre = []
         while len(items) > 0:
@@ -483,7 +618,21 @@ def text_rich_cmp(params, out, expect, outtitle):
                     lre.append("\\s+")
             else:
                 lre.append(expr)
-        lines.append((line, "".join(lre)))
+        lines.append((line, re.compile("^" + "".join(lre) + "$")))
+    return lines
+
+
+def text_rich_cmp(params, out, expect: Union[str, RichCmpLines], outtitle):
+    """
+    Compare text line-by-line against an expectation with embedded regexes.
+
+    :param expect: either expected text, or the result of a previous
+       :py:func:`text_rich_compile` call.
+    """
+    if isinstance(expect, str):
+        lines = text_rich_compile(params, expect)
+    else:
+        lines = expect
 
     x_got, x_exp = [], []
     fail = False
@@ -495,7 +644,11 @@ def text_rich_cmp(params, out, expect, outtitle):
             continue
 
         ref_line, ref_re = lines[i]
-        if re.match("^" + ref_re + "$", out_line):
+        if isinstance(ref_re, str):
+            matched = ref_re == out_line
+        else:
+            matched = ref_re.match(out_line) is not None
+        if matched:
             x_got.append(out_line)
             x_exp.append(out_line)
         else: